@@ -2,18 +2,32 @@
 
 from .device_scanner import (
 	get_qualcomm_serials,
+	iter_qualcomm_serials,
+	first_qualcomm_serial,
 	get_usb_devices_sysfs,
 	parse_adb_devices,
 	correlate_adb_and_usb,
 	adb_reboot_edl,
+	invalidate_usb_cache,
+	open_usb_uevent_socket,
+	is_usb_hotplug_event,
+	extract_serial,
 )
-from .flasher import flash_device
+from .flasher import flash_device, flash_device_async, flash_devices_parallel
 
 __all__ = [
 	'get_qualcomm_serials',
+	'iter_qualcomm_serials',
+	'first_qualcomm_serial',
 	'get_usb_devices_sysfs',
 	'parse_adb_devices',
 	'correlate_adb_and_usb',
 	'adb_reboot_edl',
+	'invalidate_usb_cache',
+	'open_usb_uevent_socket',
+	'is_usb_hotplug_event',
+	'extract_serial',
 	'flash_device',
+	'flash_device_async',
+	'flash_devices_parallel',
 ]
@@ -1,204 +1,456 @@
 import os
+import re
+import shutil
+import socket
 import subprocess
-from typing import Dict, List, Optional
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple, Union
+
+
+# __slots__ is declared by hand rather than with dataclass(slots=True), which
+# needs Python 3.10
+@dataclass
+class UsbDevice:
+    """A USB device as read from sysfs."""
+
+    __slots__ = ("name", "vendor", "product", "serial", "product_str", "sys_path")
+
+    name: str
+    vendor: str
+    product: str
+    serial: Optional[str]
+    product_str: Optional[str]
+    sys_path: str
+
+    def as_dict(self) -> Dict[str, Optional[str]]:
+        return {f: getattr(self, f) for f in self.__slots__}
+
+
+@dataclass(init=False)
+class AdbDevice:
+    """One line of `adb devices -l`."""
+
+    # Class-level defaults would clash with the slots, so __init__ supplies them
+    __slots__ = ("serial", "state", "usb", "transport_id", "product", "model", "device")
+
+    serial: str
+    state: str
+    usb: Optional[str]
+    transport_id: Optional[str]
+    product: Optional[str]
+    model: Optional[str]
+    device: Optional[str]
+
+    def __init__(
+        self,
+        serial: str,
+        state: str,
+        usb: Optional[str] = None,
+        transport_id: Optional[str] = None,
+        product: Optional[str] = None,
+        model: Optional[str] = None,
+        device: Optional[str] = None,
+    ) -> None:
+        self.serial = serial
+        self.state = state
+        self.usb = usb
+        self.transport_id = transport_id
+        self.product = product
+        self.model = model
+        self.device = device
+
+    def as_dict(self) -> Dict[str, Optional[str]]:
+        return {f: getattr(self, f) for f in self.__slots__}
+
+
+_USB_ROOT = "/sys/bus/usb/devices"
+# Qualcomm EDL (9008) PID; such devices are kept by vendor-filtered scans too
+_EDL_PID = "9008"
+# Key under which a device's directory fd is held alongside its attribute fds
+_DIRFD = "."
+
+# Last sysfs enumeration per vendor filter, keyed by the (name, inode) pairs seen
+# in the bus directory. sysfs does not reliably bump the directory mtime, but every
+# device add/remove (including a re-enumeration on the same port, e.g.
+# adb -> EDL) creates a new kernfs node with a fresh inode number.
+_USB_CACHE: Dict[Optional[str], Tuple[FrozenSet[Tuple[str, int]], Dict[str, "UsbDevice"]]] = {}
+# `adb devices -l` is a process spawn; absorb bursts of polls with a short TTL.
+_ADB_CACHE = {"time": 0.0, "data": None}
+_ADB_CACHE_TTL = 0.5
+# Directory and attribute fds held open per (name, inode) so rescans are
+# lseek+read only; None marks an attribute the device doesn't have.
+# Guarded by _USB_LOCK since scans may run from worker threads.
+_OPEN_FDS: Dict[Tuple[str, int], Dict[str, Optional[int]]] = {}
+_USB_LOCK = threading.Lock()
+
+# Many EDL devices embed the serial in the product string (e.g. "..._SN:CB4713E8")
+_SN_RE = re.compile(r"SN[:=]?([A-F0-9]+)", re.IGNORECASE)
+
+# `adb devices -l` lines: "<serial> <state> [key:value ...]"
+_ADB_LINE_RE = re.compile(rb"^(\S+)\s+(\S+)(?:\s+(.*))?$")
+_ADB_KV_RE = re.compile(rb"(?<!\S)(\w+):(\S+)")
+_ADB_FIELDS = frozenset((b"usb", b"transport_id", b"product", b"model", b"device"))
+
+# Absolute adb path, resolved once. Spawning by absolute path with close_fds=False
+# lets subprocess use posix_spawn (vfork) instead of fork+exec of the whole process.
+_ADB_EXEC: Optional[str] = None
+
+_ADB_SERVER = ("127.0.0.1", int(os.environ.get("ANDROID_ADB_SERVER_PORT", "5037")))
+
+# Kernel hotplug events (linux/netlink.h); group 1 is the kernel's own broadcast,
+# which doesn't depend on udevd running
+_NETLINK_KOBJECT_UEVENT = 15
+_UEVENT_KERNEL_GROUP = 1
+_UEVENT_ACTIONS = frozenset((b"ACTION=add", b"ACTION=remove"))
+_UEVENT_RCVBUF = 1 << 20
+
+
+def _close_sysfs_attrs(key: Tuple[str, int]) -> None:
+    for fd in _OPEN_FDS.pop(key, {}).values():
+        if fd is None:
+            continue
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+def _read_sysfs_attr(fds: Dict[str, Optional[int]], attr: str) -> Optional[str]:
+    """Read a device attribute through its held fd, opening it on first use."""
+    if attr not in fds:
+        dirfd = fds.get(_DIRFD)
+        try:
+            fds[attr] = None if dirfd is None else os.open(attr, os.O_RDONLY, dir_fd=dirfd)
+        except OSError:
+            fds[attr] = None
+    fd = fds[attr]
+    if fd is None:
+        return None
+    try:
+        os.lseek(fd, 0, os.SEEK_SET)
+        data = os.read(fd, 4096)
+    except OSError:
+        # Device unplugged since the fd was opened
+        return None
+    return data.decode("utf-8", errors="ignore").strip()
+
+
+def invalidate_usb_cache() -> None:
+    """Drop the cached sysfs and adb enumerations so the next scan is fresh."""
+    _USB_CACHE.clear()
+    _ADB_CACHE["time"] = 0.0
+    _ADB_CACHE["data"] = None
 
 
-def _read_sysfs_file(path: str) -> Optional[str]:
+def _scan_usb_devices(vendor: Optional[str] = None) -> Dict[str, UsbDevice]:
+    """Enumerate /sys/bus/usb/devices, cached until a device is added or removed.
+
+    With a vendor filter, other vendors' devices are skipped after reading
+    idVendor and idProduct only; those in EDL mode (PID 9008) are still kept.
+    """
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            return f.read().strip()
-    except FileNotFoundError:
-        return None
-    except Exception:
-        return None
+        with os.scandir(_USB_ROOT) as it:
+            # kernel names for devices are digits and dashes (e.g. '1-1', '2-1.4');
+            # interfaces carry a colon ('1-1:1.0') and root hubs are 'usbN'.
+            # Entries here are symlinks (d_type DT_LNK), so is_dir(follow_symlinks=False)
+            # would reject everything and is_dir() costs a stat; the name filter is free
+            # and the O_DIRECTORY open below doubles as the type check.
+            entries = [e for e in it if ":" not in e.name and e.name[0].isdigit()]
+    except OSError:
+        return {}
+
+    with _USB_LOCK:
+        signature = frozenset((e.name, e.inode()) for e in entries)
+        cached = _USB_CACHE.get(vendor)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        devices: Dict[str, UsbDevice] = {}
+        for entry in entries:
+            name = entry.name
+            key = (name, entry.inode())
+            fds = _OPEN_FDS.get(key)
+            if fds is None:
+                fds = _OPEN_FDS[key] = {}
+                try:
+                    fds[_DIRFD] = os.open(entry.path, os.O_RDONLY | os.O_DIRECTORY)
+                except OSError:
+                    continue
+            dev_vendor = (_read_sysfs_attr(fds, "idVendor") or "").lower()
+            product = _read_sysfs_attr(fds, "idProduct")
+            if vendor is not None and dev_vendor != vendor and (product or "").lower() != _EDL_PID:
+                continue
+            if not dev_vendor or not product:
+                # Not a USB device with vendor/product IDs
+                continue
+            serial = _read_sysfs_attr(fds, "serial")
+            product_str = _read_sysfs_attr(fds, "product")
+
+            devices[name] = UsbDevice(
+                name=name,
+                vendor=dev_vendor,
+                product=product.lower(),
+                serial=serial,
+                product_str=product_str,
+                sys_path=entry.path,
+            )
+
+        # Release fds of devices that were unplugged or re-enumerated
+        for key in [k for k in _OPEN_FDS if k not in signature]:
+            _close_sysfs_attrs(key)
+
+        _USB_CACHE[vendor] = (signature, devices)
+        return devices
 
 
-def get_usb_devices_sysfs() -> Dict[str, Dict[str, Optional[str]]]:
+def get_usb_devices_sysfs(vendor: Optional[str] = None) -> Dict[str, Dict[str, Optional[str]]]:
     """Enumerate USB devices from /sys/bus/usb/devices.
 
     Returns a mapping keyed by the kernel USB device name (e.g. '1-1', '1-9.1')
     with values containing idVendor, idProduct, serial (if available) and product string.
+    If vendor is given (lowercase hex, e.g. '05c6') devices from other vendors are
+    skipped after reading their idVendor/idProduct only, unless they are in EDL
+    mode (idProduct 9008).
+    The underlying scan is cached until a device is added to or removed from the bus.
     """
-    usb_root = "/sys/bus/usb/devices"
-    devices: Dict[str, Dict[str, Optional[str]]] = {}
-    if not os.path.isdir(usb_root):
-        return devices
+    return {name: dev.as_dict() for name, dev in _scan_usb_devices(vendor).items()}
+
+
+def open_usb_uevent_socket() -> Optional[socket.socket]:
+    """Subscribe to kernel hotplug (uevent) messages over netlink.
 
-    for name in os.listdir(usb_root):
-        # Skip entries that are not device directories (they may contain colons for interfaces)
-        path = os.path.join(usb_root, name)
-        if not os.path.isdir(path):
+    Returns a bound socket, or None where netlink is unavailable (non-Linux,
+    sandboxed), in which case callers should fall back to polling.
+    recv() on it fails with ENOBUFS when events were dropped; callers should
+    treat that as "something changed" and keep reading.
+    """
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM | socket.SOCK_CLOEXEC, _NETLINK_KOBJECT_UEVENT)
+    except (AttributeError, OSError):
+        return None
+    try:
+        sock.bind((0, _UEVENT_KERNEL_GROUP))
+    except OSError:
+        sock.close()
+        return None
+    # The kernel group carries every subsystem's events; a roomy buffer keeps
+    # bursts (e.g. several devices rebooting at once) from overflowing it.
+    # SO_RCVBUFFORCE ignores rmem_max but needs CAP_NET_ADMIN.
+    for opt in (getattr(socket, "SO_RCVBUFFORCE", None), socket.SO_RCVBUF):
+        if opt is None:
             continue
-        # kernel names for devices are digits and dashes (e.g. '1-1', '2-1.4')
-        if not (name[0].isdigit()):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, opt, _UEVENT_RCVBUF)
+            break
+        except OSError:
             continue
+    return sock
 
-        vendor = _read_sysfs_file(os.path.join(path, "idVendor"))
-        product = _read_sysfs_file(os.path.join(path, "idProduct"))
-        serial = _read_sysfs_file(os.path.join(path, "serial"))
-        product_str = _read_sysfs_file(os.path.join(path, "product"))
 
-        if not vendor or not product:
-            # Not a USB device with vendor/product IDs (could be interface entries)
-            continue
+def is_usb_hotplug_event(msg: bytes) -> bool:
+    """True if a raw uevent message reports a USB device being added or removed."""
+    # "<action>@<devpath>\0KEY=VALUE\0..."
+    fields = msg.split(b"\0")
+    return b"SUBSYSTEM=usb" in fields and b"DEVTYPE=usb_device" in fields and not _UEVENT_ACTIONS.isdisjoint(fields)
 
-        devices[name] = {
-            "name": name,
-            "vendor": vendor.lower(),
-            "product": product.lower(),
-            "serial": serial,
-            "product_str": product_str,
-            "sys_path": path,
-        }
 
-    return devices
+def _adb_cmd(*args: str) -> List[str]:
+    global _ADB_EXEC
+    if _ADB_EXEC is None:
+        _ADB_EXEC = shutil.which("adb")
+    return [_ADB_EXEC or "adb", *args]
 
 
-def parse_adb_devices() -> List[Dict[str, Optional[str]]]:
-    """Call `adb devices -l` and parse its output.
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = b""
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("adb server closed the connection")
+        buf += chunk
+    return buf
 
-    Returns a list of dicts with keys: serial, state, usb (kernel name like '1-1'), transport_id,
-    product, model, device.
+
+def _adb_host_query(cmd: bytes) -> bytes:
+    """Send a host service request (e.g. b'host:devices-l') to the local adb server.
+
+    Uses the adb smart-socket protocol directly: a 4 hex digit length prefix on the
+    request, then an OKAY/FAIL status followed by a length-prefixed payload.
+    Raises OSError if the server is not reachable or rejects the request.
     """
-    try:
-        result = subprocess.run(
-            ["adb", "devices", "-l"], capture_output=True, text=True, check=True
-        )
-    except FileNotFoundError:
-        # adb not installed/available
-        return []
-    except subprocess.CalledProcessError:
-        # adb command failed (perhaps adb server not running), return empty list
-        return []
-
-    devices: List[Dict[str, Optional[str]]] = []
-    lines = result.stdout.splitlines()
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        if line.startswith("List of devices attached"):
-            continue
+    with socket.create_connection(_ADB_SERVER, timeout=1.0) as sock:
+        sock.sendall(b"%04x%s" % (len(cmd), cmd))
+        status = _recv_exact(sock, 4)
+        length = int(_recv_exact(sock, 4), 16)
+        payload = _recv_exact(sock, length)
+    if status != b"OKAY":
+        raise OSError(f"adb server refused {cmd!r}: {payload.decode('utf-8', errors='replace')}")
+    return payload
 
-        parts = line.split()
-        if len(parts) < 2:
+
+def _query_adb_devices() -> List[AdbDevice]:
+    """Query the adb server for `devices -l`, reusing the result for a short TTL.
+
+    The server is asked directly over its local socket; if it is not running we fall
+    back to the `adb devices -l` CLI, which also starts it for subsequent polls.
+    """
+    now = time.monotonic()
+    if _ADB_CACHE["data"] is not None and now - _ADB_CACHE["time"] < _ADB_CACHE_TTL:
+        return _ADB_CACHE["data"]
+
+    try:
+        output = _adb_host_query(b"host:devices-l")
+    except (OSError, ValueError):
+        try:
+            result = subprocess.run(
+                _adb_cmd("devices", "-l"), capture_output=True, check=True, close_fds=False
+            )
+        except FileNotFoundError:
+            # adb not installed/available
+            return []
+        except subprocess.CalledProcessError:
+            # adb command failed (perhaps adb server not running), return empty list
+            return []
+        output = result.stdout
+
+    devices: List[AdbDevice] = []
+    for line in output.splitlines():
+        m = _ADB_LINE_RE.match(line.strip())
+        if not m or line.startswith(b"List of devices attached"):
             continue
-        serial = parts[0]
-        state = parts[1]
+        serial, state, rest = m.groups()
 
-        info = {"serial": serial, "state": state, "usb": None, "transport_id": None, "product": None, "model": None, "device": None}
-        # parse remaining key:value tokens
-        for token in parts[2:]:
-            if ":" not in token:
-                continue
-            key, val = token.split(":", 1)
-            if key == "usb":
-                # adb reports usb:1-1
-                info["usb"] = val
-            elif key == "transport_id":
-                info["transport_id"] = val
-            elif key == "product":
-                info["product"] = val
-            elif key == "model":
-                info["model"] = val
-            elif key == "device":
-                info["device"] = val
+        info = AdbDevice(serial.decode("utf-8", errors="replace"), state.decode("utf-8", errors="replace"))
+        # remaining key:value tokens, e.g. usb:1-1 transport_id:3
+        if rest:
+            for key, val in _ADB_KV_RE.findall(rest):
+                if key in _ADB_FIELDS:
+                    setattr(info, key.decode(), val.decode("utf-8", errors="replace"))
 
         devices.append(info)
 
+    _ADB_CACHE["time"] = now
+    _ADB_CACHE["data"] = devices
     return devices
 
 
-def correlate_adb_and_usb() -> List[Dict[str, Optional[str]]]:
-    """Return a list of devices combining adb and sysfs USB info.
+def parse_adb_devices() -> List[Dict[str, Optional[str]]]:
+    """Query the adb server for `devices -l` and parse the result.
 
-    Each returned dict will include at least:
-    - serial (adb serial if present)
-    - state (adb state)
-    - usb (kernel usb name like '1-1')
-    - transport_id (adb transport id)
-    - vendor, product (from sysfs idVendor/idProduct if available)
-    - status: 'adb' if present in adb list, 'edl' if a Qualcomm USB device exists but not in adb, else 'unknown'
+    Returns a list of dicts with keys: serial, state, usb (kernel name like '1-1'), transport_id,
+    product, model, device. Results are reused for a short TTL to absorb bursts of polls.
     """
-    usb_map = get_usb_devices_sysfs()
-    adb_list = parse_adb_devices()
+    return [a.as_dict() for a in _query_adb_devices()]
 
-    # Start with adb devices
-    combined: List[Dict[str, Optional[str]]] = []
-    adb_usb_names = set()
 
-    for a in adb_list:
-        usb_name = a.get("usb")
-        vendor = None
-        product = None
-        serial = None
-        if usb_name and usb_name in usb_map:
-            u = usb_map[usb_name]
-            vendor = u.get("vendor")
-            product = u.get("product")
-            serial = u.get("serial")
-            adb_usb_names.add(usb_name)
-
-        status = "adb"
-        combined.append({
-            "serial": a.get("serial"),
-            "state": a.get("state"),
-            "usb": usb_name,
-            "transport_id": a.get("transport_id"),
-            "vendor": vendor,
-            "product": product,
-            "product_str": usb_map.get(usb_name, {}).get("product_str") if usb_name else None,
-            "status": status,
-        })
-
-    # Add USB-only devices (not present in adb). These may be in EDL or otherwise not in adb-mode.
+def _iter_correlated(vendor: Optional[str] = None) -> Iterator[Dict[str, Optional[str]]]:
+    """Lazily yield the records described in correlate_adb_and_usb."""
+    usb_map = _scan_usb_devices(vendor)
+    # A filtered scan with no device of that vendor attached has nothing adb
+    # could add; don't pay for the round-trip. Unfiltered scans always ask adb.
+    if vendor is None or any(u.vendor == vendor for u in usb_map.values()):
+        adb_list = _query_adb_devices()
+    else:
+        adb_list = []
+    adb_by_usb = {a.usb: a for a in adb_list if a.usb in usb_map}
+
     for usb_name, u in usb_map.items():
-        if usb_name in adb_usb_names:
+        a = adb_by_usb.get(usb_name)
+        if a is not None:
+            yield {
+                "serial": a.serial,
+                "state": a.state,
+                "usb": usb_name,
+                "transport_id": a.transport_id,
+                "vendor": u.vendor,
+                "product": u.product,
+                "product_str": u.product_str,
+                "model": a.model,
+                "device": a.device,
+                "status": "adb",
+            }
             continue
-        vendor = u.get("vendor")
-        product = u.get("product")
+        # Not in adb; these may be in EDL or otherwise not in adb-mode.
         # Detect common EDL indications:
         # - product id 9008 is the common Qualcomm EDL PID
         # - vendor 05c6 (Qualcomm) not present in adb may indicate EDL as well
-        known_edl_pids = {"9008"}
-        if product in known_edl_pids:
-            status = "edl"
-        elif vendor == "05c6":
-            status = "edl"
-        else:
-            status = "unknown"
-
-        combined.append({
-            "serial": u.get("serial"),
+        yield {
+            "serial": u.serial,
             "state": None,
             "usb": usb_name,
             "transport_id": None,
-            "vendor": vendor,
-            "product": product,
-            "product_str": u.get("product_str"),
-            "status": status,
-        })
+            "vendor": u.vendor,
+            "product": u.product,
+            "product_str": u.product_str,
+            "model": None,
+            "device": None,
+            "status": "edl" if u.product == "9008" or u.vendor == "05c6" else "unknown",
+        }
+
+    # adb devices without a sysfs match (e.g. over TCP) come last
+    for a in adb_list:
+        if a.usb in adb_by_usb:
+            continue
+        yield {
+            "serial": a.serial,
+            "state": a.state,
+            "usb": a.usb,
+            "transport_id": a.transport_id,
+            "vendor": None,
+            "product": None,
+            "product_str": None,
+            "model": a.model,
+            "device": a.device,
+            "status": "adb",
+        }
 
-    return combined
 
+def correlate_adb_and_usb(vendor: Optional[str] = None) -> List[Dict[str, Optional[str]]]:
+    """Return a list of devices combining adb and sysfs USB info.
 
-def adb_reboot_edl(transport_id: str, confirm: bool = True) -> Dict[str, str]:
+    Each returned dict will include at least:
+    - serial (adb serial if present)
+    - state (adb state)
+    - usb (kernel usb name like '1-1')
+    - transport_id (adb transport id)
+    - vendor, product (from sysfs idVendor/idProduct if available)
+    - model, device (as reported inline by `adb devices -l`, for adb devices)
+    - status: 'adb' if present in adb list, 'edl' if a Qualcomm USB device exists but not in adb, else 'unknown'
+
+    If vendor is given only USB devices with that idVendor, or in EDL mode
+    (idProduct 9008) from any vendor, are considered.
+    With a vendor filter, adb is only queried when a USB device of that
+    vendor is present.
+    """
+    return list(_iter_correlated(vendor))
+
+
+def adb_reboot_edl(transport_id: str, confirm: Union[bool, Callable[[], bool]] = True) -> Dict[str, str]:
     """Attempt to reboot the adb device identified by transport_id into EDL.
 
     If confirm is True the function will prompt the user via input() before proceeding.
+    confirm may also be a callable returning True to proceed, so UIs can ask without
+    blocking on stdin.
     Returns a dict with keys: success ("true"/"false"), msg (human-readable)
     """
     if not transport_id:
         return {"success": "false", "msg": "No transport_id provided"}
 
-    if confirm:
+    if callable(confirm):
+        if not confirm():
+            return {"success": "false", "msg": "User cancelled"}
+    elif confirm:
         ans = input(f"Reboot adb device with transport_id={transport_id} into EDL? [y/N]: ")
         if ans.strip().lower() not in ("y", "yes"):
             return {"success": "false", "msg": "User cancelled"}
 
     try:
         # adb -t <transport_id> reboot edl
-        subprocess.run(["adb", "-t", str(transport_id), "reboot", "edl"], check=True)
+        subprocess.run(_adb_cmd("-t", str(transport_id), "reboot", "edl"), check=True, close_fds=False)
+        invalidate_usb_cache()
         return {"success": "true", "msg": "Sent reboot edl command"}
     except FileNotFoundError:
         return {"success": "false", "msg": "adb not found"}
@@ -235,6 +487,38 @@ if __name__ == "__main__":
                         print(res.get("msg"))
 
 
+@lru_cache(maxsize=256)
+def _serial_from_product_str(ps: str) -> Optional[str]:
+    # Device dicts are rebuilt on every scan, so memoize on the string itself
+    m = _SN_RE.search(ps)
+    return m.group(1) if m else None
+
+
+def extract_serial(d: Dict[str, Optional[str]]) -> Optional[str]:
+    """Return a device's serial: the sysfs/adb one, else an SN in its product string."""
+    return d.get("serial") or _serial_from_product_str(d.get("product_str") or "")
+
+
+def iter_qualcomm_serials() -> Iterator[str]:
+    """Lazily yield the identifiers returned by get_qualcomm_serials."""
+    # The Qualcomm VID is authoritative: other devices are dropped by the sysfs
+    # scan after reading idVendor alone, before any string attribute is read
+    for d in _iter_correlated(vendor="05c6"):
+        if d.get("vendor") != "05c6":
+            # adb devices with no USB match (e.g. over TCP) have no VID to check
+            continue
+        # Fallbacks when neither a serial nor an SN is known
+        sid = extract_serial(d) or d.get("usb") or d.get("transport_id")
+
+        if sid:
+            yield sid
+
+
+def first_qualcomm_serial() -> Optional[str]:
+    """Return the first device identifier, or None if no device is attached."""
+    return next(iter_qualcomm_serials(), None)
+
+
 def get_qualcomm_serials() -> List[str]:
     """Backwards-compatible helper.
 
@@ -243,25 +527,4 @@ def get_qualcomm_serials() -> List[str]:
     the device serial from sysfs (if available), otherwise the kernel usb path
     (e.g. '1-1'), otherwise the adb transport id.
     """
-    import re
-
-    devices = correlate_adb_and_usb()
-    ids: List[str] = []
-    for d in devices:
-        # Prefer an explicit serial if available
-        sid = d.get("serial")
-        if not sid:
-            # Try to extract SN from product_str (many EDL devices embed SN in the product string)
-            ps = d.get("product_str") or ""
-            m = re.search(r"SN[:=]?([A-F0-9]+)", ps, re.IGNORECASE)
-            if m:
-                sid = m.group(1)
-
-        # Fallbacks
-        if not sid:
-            sid = d.get("usb") or d.get("transport_id")
-
-        if sid:
-            ids.append(sid)
-
-    return ids
+    return list(iter_qualcomm_serials())
@@ -1,30 +1,118 @@
 """Flasher module for flashing Qualcomm devices using QDL."""
 
+import asyncio
 import subprocess
 import os
 import re
-from pathlib import Path
-from typing import Optional, Callable, Dict
+import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Dict, List, Tuple, Union
+
+# qdl output is read in large raw chunks and split into lines ourselves
+_READ_CHUNK = 65536
+# Seconds a cancelled qdl gets to exit on SIGTERM before it is killed
+_TERMINATE_TIMEOUT = 5.0
+# Same line endings text mode would have recognised (universal newlines)
+_NEWLINE_RE = re.compile(rb"\r\n|[\r\n]")
+
+_RAWPROGRAM_XML = "rawprogram_unsparse0.xml"
+# <program> entries qdl will actually write (those with an image file)
+_PROGRAM_RE = re.compile(rb'<program\b[^>]*\bfilename="[^"]+"')
+# Progress markers in qdl output, matched on the raw bytes of each line
+_PROGRESS_RE = re.compile(rb'flashed "[^"]*" successfully')
+
+# Firmware directories found complete: path -> directory mtime_ns at the time.
+# Only positive results are kept: on filesystems with coarse timestamps (FAT,
+# exFAT, NFS attribute caching) files copied in within the same mtime tick
+# would otherwise stay "missing" until the directory changes again.
+_COMPLETE_FW_DIRS: Dict[str, int] = {}
+
+# Resolved qdl executable; looked up once rather than walking $PATH per flash
+_QDL_EXEC: Optional[str] = None
+
+
+def _get_qdl() -> str:
+    global _QDL_EXEC
+    if _QDL_EXEC is None:
+        # prefer absolute qdl path if available (snap may place it in /snap/bin);
+        # a miss is not cached so installing qdl later is picked up
+        _QDL_EXEC = shutil.which("qdl")
+    return _QDL_EXEC or "qdl"
+
+
+def invalidate_qdl_cache() -> None:
+    """Forget the resolved qdl path (e.g. after installing qdl while running)."""
+    global _QDL_EXEC
+    _QDL_EXEC = None
+
+
+def _split_lines(pending: bytes, chunk: bytes) -> Tuple[List[bytes], bytes]:
+    """Split buffered output into complete lines, returning (lines, unfinished tail)."""
+    data = pending + chunk
+    # Hold back a trailing CR in case its LF arrives with the next read
+    held = b""
+    if data.endswith(b"\r"):
+        data, held = data[:-1], b"\r"
+    lines = _NEWLINE_RE.split(data)
+    return lines, lines.pop() + held
+
+
+def _count_program_ops(firmware_path: str) -> int:
+    """Number of images qdl is expected to write for this firmware directory."""
+    try:
+        with open(os.path.join(firmware_path, _RAWPROGRAM_XML), "rb") as f:
+            return len(_PROGRAM_RE.findall(f.read()))
+    except OSError:
+        return 0
 
 
 def validate_firmware_path(path: str) -> bool:
-    if not os.path.isdir(path):
+    try:
+        st = os.stat(path)
+    except OSError:
         return False
+    if not stat.S_ISDIR(st.st_mode):
+        return False
+    # A directory's mtime changes whenever entries are added, removed or renamed
+    if _COMPLETE_FW_DIRS.get(path) == st.st_mtime_ns:
+        return True
+    if not _firmware_dir_complete(path):
+        return False
+    _COMPLETE_FW_DIRS[path] = st.st_mtime_ns
+    return True
+
+
+def _firmware_dir_complete(path: str) -> bool:
+    # Single directory pass; stop as soon as both kinds of file have been seen
+    has_elf = has_xml = False
+    with os.scandir(path) as it:
+        for entry in it:
+            name = entry.name
+            if name.endswith('.elf'):
+                has_elf = True
+            elif name.endswith('.xml'):
+                has_xml = True
+            if has_elf and has_xml:
+                return True
     
-    firmware_dir = Path(path)
-    has_elf = any(f.suffix == '.elf' for f in firmware_dir.iterdir())
-    has_xml = any(f.suffix == '.xml' for f in firmware_dir.iterdir())
-    
-    return has_elf and has_xml
+    return False
 
 
-def flash_device(
+def _qdl_command(
     serial: str,
     firmware_path: str,
-    storage_type: str = "emmc",
-    output_callback: Optional[Callable[[str], None]] = None,
-    logs_dir: Optional[str] = "backend/logs",
-) -> int:
+    storage_type: str,
+    multiplier: Optional[int] = None,
+    use_sudo: bool = True,
+) -> List[str]:
+    """Validate the flash arguments and build the qdl command line.
+
+    multiplier, when given, is passed as ``--multiplier`` to let qdl submit larger
+    USB OUT transfers; it is left out by default since not every qdl build has it.
+    use_sudo=False runs qdl directly, for hosts where a udev rule grants access
+    to the EDL device (see udev/70-qualcomm-qdl.rules).
+    """
     if not serial:
         raise ValueError("Serial number is required")
     
@@ -36,55 +124,254 @@ def flash_device(
     if not validate_firmware_path(firmware_path):
         raise ValueError(f"Firmware path does not contain required .elf and .xml files: {firmware_path}")
     
-    # prefer absolute qdl path if available (snap may place it in /snap/bin)
-    import shutil
-    qdl_exec = shutil.which("qdl") or "qdl"
+    qdl_exec = _get_qdl()
 
-    cmd = [
-        "sudo", qdl_exec,
+    cmd = ["sudo", qdl_exec] if use_sudo else [qdl_exec]
+    cmd += [
         "-S", serial,  # device serial
         "--storage", storage_type,
+    ]
+    if multiplier:
+        cmd += ["--multiplier", str(multiplier)]
+    return cmd + [
         "prog_firehose_ddr.elf",
-        "rawprogram_unsparse0.xml",
+        _RAWPROGRAM_XML,
         "patch0.xml"
     ]
-    
-    # Run the command from inside the firmware directory (cd into firmware_path).
+
+
+def _progress_tracker(
+    firmware_path: str,
+    progress_callback: Optional[Callable[[int], None]],
+) -> Optional[Callable[[bytes], None]]:
+    """Return a per-line handler that turns qdl output into percentages, or None."""
+    total_ops = _count_program_ops(firmware_path) if progress_callback else 0
+    if not total_ops:
+        return None
+    # Percentage progress is reported per flashed image, capped at 99 until qdl exits
+    progress_scale = 100.0 / total_ops
+    state = {"completed": 0, "last": -1}
+
+    def _on_line(line: bytes) -> None:
+        if _PROGRESS_RE.search(line):
+            state["completed"] += 1
+            progress = min(int(state["completed"] * progress_scale), 99)
+            # Only notify when the integer percentage actually moves
+            if progress != state["last"]:
+                state["last"] = progress
+                progress_callback(progress)
+
+    return _on_line
+
+
+def _output_handler(
+    firmware_path: str,
+    output_callback: Optional[Callable[[str], None]],
+    progress_callback: Optional[Callable[[int], None]],
+) -> Tuple[Callable[[bytes], None], Callable[[], None]]:
+    """Return (feed, finish) for raw qdl output shared by both flash variants.
+
+    feed takes each chunk read from qdl's stdout and dispatches its complete
+    lines to the callbacks; finish flushes an unterminated last line.
+    """
+    on_progress = _progress_tracker(firmware_path, progress_callback)
+    state = {"pending": b""}
+
+    def _feed(chunk: bytes) -> None:
+        # Chunks are always read so qdl never blocks on a full pipe; only
+        # split and decode them when someone is listening
+        if output_callback is None and on_progress is None:
+            return
+        lines, state["pending"] = _split_lines(state["pending"], chunk)
+        for line in lines:
+            if on_progress:
+                on_progress(line)
+            if output_callback:
+                output_callback(line.decode("utf-8", errors="replace"))
+
+    def _finish() -> None:
+        tail = state["pending"].rstrip(b"\r")
+        if output_callback and tail:
+            output_callback(tail.decode("utf-8", errors="replace"))
+
+    return _feed, _finish
+
+
+def flash_device(
+    serial: str,
+    firmware_path: str,
+    storage_type: str = "emmc",
+    output_callback: Optional[Callable[[str], None]] = None,
+    logs_dir: Optional[str] = "backend/logs",
+    progress_callback: Optional[Callable[[int], None]] = None,
+    multiplier: Optional[int] = None,
+    use_sudo: bool = True,
+) -> int:
+    cmd = _qdl_command(serial, firmware_path, storage_type, multiplier, use_sudo)
+    feed, finish = _output_handler(firmware_path, output_callback, progress_callback)
+
+    # Run the command from inside the firmware directory. cwd= applies only to the
+    # child, so concurrent flashes don't race on the process-wide working directory.
     # Stream stdout/stderr and call output_callback for each line if provided.
-    prev_cwd = os.getcwd()
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=0,
+        cwd=firmware_path,
+    ) as proc:
+        fd = proc.stdout.fileno()
+        while True:
+            chunk = os.read(fd, _READ_CHUNK)
+            if not chunk:
+                break
+            feed(chunk)
+        finish()
+
+    if progress_callback and proc.returncode == 0:
+        progress_callback(100)
+    return proc.returncode
+
+
+async def _stop_process(proc: asyncio.subprocess.Process) -> None:
+    """Ask a process to exit, killing it only if it outlives the grace period.
+
+    Under sudo, SIGKILL would only reach sudo and orphan qdl; SIGTERM is
+    relayed by sudo to qdl.
+    """
+    proc.terminate()
     try:
-        os.chdir(firmware_path)
-        proc = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-        )
+        await asyncio.wait_for(proc.wait(), _TERMINATE_TIMEOUT)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
 
-        # Stream lines to callback if provided
-        if output_callback and proc.stdout is not None:
-            for line in proc.stdout:
-                if line is None:
-                    break
-                output_callback(line.rstrip('\r\n'))
 
-        proc.wait()
-        return proc.returncode
-    finally:
-        os.chdir(prev_cwd)
+async def flash_device_async(
+    serial: str,
+    firmware_path: str,
+    storage_type: str = "emmc",
+    output_callback: Optional[Callable[[str], None]] = None,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    multiplier: Optional[int] = None,
+    use_sudo: bool = True,
+) -> int:
+    """asyncio variant of flash_device.
+
+    qdl output is awaited on the running event loop, so callbacks are invoked
+    on that loop's thread and may touch loop-owned state directly.
+    """
+    cmd = _qdl_command(serial, firmware_path, storage_type, multiplier, use_sudo)
+    feed, finish = _output_handler(firmware_path, output_callback, progress_callback)
+
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        cwd=firmware_path,
+    )
+    try:
+        while True:
+            chunk = await proc.stdout.read(_READ_CHUNK)
+            if not chunk:
+                break
+            feed(chunk)
+        finish()
+        returncode = await proc.wait()
+    except BaseException:
+        # Cancelled (e.g. app shutdown): don't leave qdl running unattended
+        if proc.returncode is None:
+            await _stop_process(proc)
+        raise
+
+    if progress_callback and returncode == 0:
+        progress_callback(100)
+    return returncode
+
+
+def flash_devices_parallel(
+    jobs: List[Tuple[str, str]],
+    max_workers: int = 4,
+    storage_type: str = "emmc",
+    output_callback: Optional[Callable[[str, str], None]] = None,
+    multiplier: Optional[int] = None,
+    use_sudo: bool = True,
+) -> Dict[str, Union[int, Exception]]:
+    """Flash several devices concurrently.
+
+    Args:
+        jobs: (serial, firmware_path) pairs, one per serial
+        max_workers: maximum number of qdl processes running at once
+        storage_type: storage type passed to every flash
+        output_callback: called with (serial, line) for each line of qdl output.
+            It is called concurrently from the worker threads, so it must be
+            thread-safe.
+        multiplier: optional qdl --multiplier (USB OUT transfer size) for every flash
+        use_sudo: run qdl through sudo (False when a udev rule grants access)
+
+    Returns:
+        Mapping of serial -> qdl return code, or the exception that job raised
+        (e.g. a bad firmware path or missing qdl). One failing job does not
+        affect the others.
+
+    Raises:
+        ValueError: if a serial appears in more than one job
+    """
+    serials = [serial for serial, _ in jobs]
+    duplicates = sorted({serial for serial in serials if serials.count(serial) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate serials in flash jobs: {', '.join(duplicates)}")
+
+    def _run(serial: str, firmware_path: str) -> int:
+        def _tagged(line: str) -> None:
+            output_callback(serial, line)
+
+        return flash_device(
+            serial,
+            firmware_path,
+            storage_type,
+            output_callback=_tagged if output_callback else None,
+            multiplier=multiplier,
+            use_sudo=use_sudo,
+        )
+
+    # Each worker just blocks on its qdl pipe, so threads are enough
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {serial: pool.submit(_run, serial, path) for serial, path in jobs}
+    results: Dict[str, Union[int, Exception]] = {}
+    for serial, fut in futures.items():
+        try:
+            results[serial] = fut.result()
+        except Exception as e:
+            results[serial] = e
+    return results
 
 
 # Compatibility wrapper for old code
-def flash_qdl(serial: str, path: str) -> None:
+def flash_qdl(
+    serial: str,
+    path: str,
+    multiplier: Optional[int] = None,
+    output_callback: Optional[Callable[[str], None]] = None,
+    use_sudo: bool = True,
+) -> None:
     """
     Legacy flash function for backward compatibility.
     
     Args:
         serial: Serial number of the device
         path: Directory containing QDL firmware files
+        multiplier: Optional qdl --multiplier for larger USB OUT transfers
+        output_callback: Optional callback for each line of qdl output
+        use_sudo: Run qdl through sudo (False when a udev rule grants access)
     """
-    result = flash_device(serial, path)
+    result = flash_device(
+        serial,
+        path,
+        output_callback=output_callback,
+        multiplier=multiplier,
+        use_sudo=use_sudo,
+    )
     if result != 0:
         raise subprocess.CalledProcessError(result, f"qdl flash {serial}")
 
@@ -2,20 +2,77 @@ from textual.app import App, ComposeResult
 from textual.containers import Vertical, Horizontal, Container
 from textual.widgets import Header, Footer, Static, DataTable, Label, Input
 from textual.binding import Binding
+from textual.widgets.data_table import RowKey
 from textual import work
-from typing import List, Dict, Optional
+from textual.message import Message
+from textual.timer import Timer
+from textual.worker import get_current_worker
+from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import errno
+import os
+import select
+import sys
+import threading
 import time
 from pathlib import Path
 
-from backend import correlate_adb_and_usb, adb_reboot_edl, flash_device
-# Display latest streamed log line only; no on-disk parsing required here
+from backend import (
+    correlate_adb_and_usb,
+    adb_reboot_edl,
+    flash_device_async,
+    open_usb_uevent_socket,
+    is_usb_hotplug_event,
+    extract_serial,
+)
+# Display the flash percentage and latest streamed log line; no on-disk parsing here
+
+# Row key of the placeholder shown when no device is attached
+_EMPTY_ROW = "__no_devices__"
+# Progress cells show at most this many characters of the latest log line
+_MAX_LINE = 80
+# Log lines kept for devices that are no longer attached are dropped past this
+_MAX_LAST_LINES = 64
+
+# Device list refresh period when polling; with hotplug events a slower safety
+# refresh remains, since adb state changes (e.g. authorisation) emit no uevent
+_POLL_INTERVAL = 2.0
+_HOTPLUG_SAFETY_INTERVAL = 10.0
+# Seconds after a hotplug event before a second scan, once adb has caught up
+_HOTPLUG_SETTLE_DELAY = 1.5
+
+# Seconds a firmware path check stays valid for the flash action
+_FW_CHECK_TTL = 2.0
+
+# Set FLASHY_NO_SUDO=1 when a udev rule (udev/70-qualcomm-qdl.rules) lets the
+# user access EDL devices, so qdl runs directly instead of through sudo
+_USE_SUDO = os.environ.get("FLASHY_NO_SUDO", "") in ("", "0")
+
+# Upper bound on concurrent adb reboot commands
+_ADB_POOL_SIZE = 16
+
+# Rebooted devices are polled for until they show up in EDL, up to the timeout
+_EDL_WAIT_TIMEOUT = 8.0
+_EDL_POLL_INTERVAL = 0.25
+
+# Devices shown in the table: Qualcomm VID, or the EDL PID from any vendor.
+# The vendor-filtered backend scan keeps the same set; filtering again here
+# drops adb transports with no USB match (no VID/PID, e.g. adb over TCP).
+_QUAL_VENDORS = frozenset({"05c6"})
+_EDL_PRODUCTS = frozenset({"9008"})
 
 
 class DeviceFlasher(App):
     """Flashy - Multi-device flasher UI."""
 
     TITLE = "Flashy"
-    
+
+    class UsbHotplug(Message):
+        """A USB device was added or removed (or uevents were lost)."""
+
+    class HotplugLost(Message):
+        """The uevent watcher stopped while the app was still running."""
+
     BINDINGS = [
         Binding("q", "quit", "Quit"),
         Binding("r", "refresh_devices", "Refresh"),
@@ -28,15 +85,48 @@ class DeviceFlasher(App):
         super().__init__()
         # devices is a list of correlated device dicts from correlate_adb_and_usb()
         self.devices: List[Dict[str, Optional[str]]] = []
+        # Same devices indexed by _device_key, rebuilt on every refresh
+        self._by_key: Dict[str, Dict[str, Optional[str]]] = {}
         # Selected set contains the key used to identify devices (usb path or serial or transport)
         self.selected_keys = set()
-        self.auto_refresh_enabled = True
+        # Threads for blocking adb calls, kept warm across reboot rounds
+        self._pool = ThreadPoolExecutor(max_workers=_ADB_POOL_SIZE, thread_name_prefix="flashy-adb")
+        # Set on unmount; stops periodic refreshes and the hotplug watcher
+        self._stop_refresh = threading.Event()
+        # Write end of a pipe that wakes the hotplug watcher out of select()
+        self._stop_pipe_w: Optional[int] = None
+        # Scans are driven by hotplug events (netlink) rather than a 2s poll
+        self._hotplug_active = False
+        # Pending extra scan after a hotplug event or while adb state settles
+        self._followup_timer: Optional[Timer] = None
+        # Periodic scan: the safety refresh with hotplug events, else the poll
+        self._scan_timer: Optional[Timer] = None
         # Flash status tracking
         self.flashing_devices = set()
         # Flash status: key -> "not started" | "in progress" | "completed"
         self.flash_status: Dict[str, str] = {}
         # Live latest log line per device (key -> last line)
         self.last_lines: Dict[str, str] = {}
+        # Flash percentage per device, from qdl's per-image progress (key -> 0..100)
+        self.flash_progress: Dict[str, int] = {}
+        # Table rows are kept across refreshes and patched cell by cell:
+        # device key -> RowKey, and device key -> cell values last written
+        self._row_keys: Dict[str, RowKey] = {}
+        self._last_rendered: Dict[str, tuple] = {}
+        # Flash output only records which rows have a new line; _flush_ui patches
+        # their Progress cells at most every 100ms. _dirty requests a full rescan.
+        self._pending_progress_keys = set()
+        self._dirty = False
+        self._latest_status: Optional[str] = None
+        # Inputs of the last table render; an identical refresh is skipped
+        self._last_sig: Optional[tuple] = None
+        # Background scan state, see _request_scan
+        self._refresh_in_progress = False
+        self._refresh_pending = False
+        # Firmware path is checked once typing pauses, not per keystroke
+        self._fw_validate_timer: Optional[Timer] = None
+        # (path, is_dir, time.monotonic() of the check)
+        self._fw_path_cache: Tuple[str, bool, float] = ("", False, 0.0)
 
     def compose(self) -> ComposeResult:
         yield Static(
@@ -61,94 +151,231 @@ class DeviceFlasher(App):
         yield Label("Status: Ready", id="status")
         yield Footer()
 
-    CSS = """
-    #flashy-logo {
-        width: 100%;
-        content-align: center middle;
-        color: $accent;
-        text-style: bold;
-        margin-top: 1;
-        margin-bottom: 1;
-    }
-
-    #firmware-row {
-        height: auto;
-        margin: 1;
-    }
-    .fw-label {
-        width: 4;
-        content-align: right middle;
-    }
-    #firmware-input {
-        width: 1fr;
-    }
-    """
+    CSS_PATH = "flashy.tcss"
 
     def on_mount(self) -> None:
-        table = self.query_one("#devices-table", DataTable)
+        # Widgets are looked up once; handlers and workers use these references
+        self._table = table = self.query_one("#devices-table", DataTable)
+        self._status = self.query_one("#status", Label)
+        self._firmware_input = self.query_one("#firmware-input", Input)
         table.cursor_type = "row"
         table.zebra_stripes = True
+        self._columns = table.add_columns("Sel", "Serial", "Status", "Progress", "Flash")
         table.focus()
-        self.refresh_devices_table()
-        self.set_interval(2.0, self._periodic_refresh)
+        # First scan runs in a worker too; a cold adb server can take seconds
+        self._request_scan()
+        # Rescan on kernel USB hotplug events; fall back to polling without netlink
+        uevents = open_usb_uevent_socket()
+        if uevents is not None:
+            self._hotplug_active = True
+            stop_r, self._stop_pipe_w = os.pipe()
+            self._uevent_watcher(uevents, stop_r)
+            self._scan_timer = self.set_interval(_HOTPLUG_SAFETY_INTERVAL, self._periodic_refresh)
+        else:
+            self._scan_timer = self.set_interval(_POLL_INTERVAL, self._periodic_refresh)
+        self.set_interval(0.1, self._flush_ui)
 
-    def _device_key(self, d: Dict[str, Optional[str]]) -> str:
-        # Unique-ish key used for selection: prefer usb path, then serial, then transport_id
-        return d.get("usb") or d.get("serial") or (d.get("transport_id") or "")
+    @staticmethod
+    def _device_key(d: Dict[str, Optional[str]]) -> str:
+        # Unique-ish key used for selection: prefer usb path, then serial, then transport_id.
+        # _apply_new_devices stores it in each device dict as "_key".
+        return d.get("usb") or d.get("serial") or d.get("transport_id") or ""
 
     def _periodic_refresh(self) -> None:
-        if self.auto_refresh_enabled:
-            # We're already running on the app/main thread via set_interval,
-            # so call refresh directly instead of call_from_thread.
-            self.refresh_devices_table()
+        if not self._stop_refresh.is_set():
+            self._request_scan()
+
+    def _request_scan(self) -> None:
+        # At most one background scan at a time; requests arriving meanwhile
+        # collapse into a single follow-up scan
+        if self._refresh_in_progress:
+            self._refresh_pending = True
+            return
+        self._refresh_in_progress = True
+        self._refresh_worker()
 
-    def refresh_devices_table(self, silent: bool = False) -> None:
-        table = self.query_one("#devices-table", DataTable)
-        status = self.query_one("#status", Label)
+    @work(thread=True, group="uevents")
+    def _uevent_watcher(self, sock, stop_r: int) -> None:
+        """Block on the netlink socket and request a scan per USB add/remove.
 
-        # Save cursor position before refresh
+        on_unmount writes to the stop pipe, so shutdown never waits on a timeout.
+        Events are posted to the app without waiting for it to handle them, so
+        the socket keeps being drained during bursts.
+        """
         try:
-            saved_cursor_row = table.cursor_row
-        except Exception:
-            saved_cursor_row = 0
+            with sock:
+                while not self._stop_refresh.is_set():
+                    ready, _, _ = select.select([sock, stop_r], [], [])
+                    if stop_r in ready:
+                        return
+                    try:
+                        msg = sock.recv(8192)
+                    except OSError as e:
+                        if e.errno == errno.ENOBUFS:
+                            # The buffer overflowed and events were lost; rescan
+                            # rather than guess which ones
+                            msg = None
+                        elif e.errno in (errno.EINTR, errno.EAGAIN):
+                            continue
+                        else:
+                            return
+                    if msg is None or is_usb_hotplug_event(msg):
+                        if not self.post_message(self.UsbHotplug()):
+                            # App already shutting down
+                            return
+        finally:
+            os.close(stop_r)
+            if not self._stop_refresh.is_set():
+                # Died on an unexpected error: polling has to take over
+                self.post_message(self.HotplugLost())
+
+    def on_device_flasher_usb_hotplug(self, message: "DeviceFlasher.UsbHotplug") -> None:
+        # Bursts of events collapse in _request_scan. adb only registers a new
+        # device some time after the kernel does, so look again once it settled.
+        if self._stop_refresh.is_set():
+            return
+        self._periodic_refresh()
+        self._schedule_followup_scan(_HOTPLUG_SETTLE_DELAY)
 
-        # Fetch correlated devices
+    def on_device_flasher_hotplug_lost(self, message: "DeviceFlasher.HotplugLost") -> None:
+        # Without hotplug events only the slow safety refresh would be left
+        if self._stop_refresh.is_set() or not self._hotplug_active:
+            return
+        self._hotplug_active = False
+        self._scan_timer.stop()
+        self._scan_timer = self.set_interval(_POLL_INTERVAL, self._periodic_refresh)
+        self._periodic_refresh()
+
+    def _schedule_followup_scan(self, delay: float) -> None:
+        # One pending follow-up at a time; a newer request replaces the old one
+        if self._followup_timer is not None:
+            self._followup_timer.stop()
+        self._followup_timer = self.set_timer(delay, self._periodic_refresh)
+
+    @staticmethod
+    def _awaiting_adb(d: Dict[str, Optional[str]]) -> bool:
+        # A Qualcomm device outside EDL that adb doesn't list (yet) is shown as
+        # EDL by the backend; it may just not be registered with adb so far
+        return d.get("vendor") == "05c6" and d.get("product") != "9008" and d.get("status") != "adb"
+
+    @work(thread=True, group="refresh")
+    def _refresh_worker(self) -> None:
+        # Scan off the app thread so slow adb/sysfs enumeration never stalls input
         try:
-            new_devices = correlate_adb_and_usb()
+            new_devices = correlate_adb_and_usb(vendor="05c6")
         except Exception as e:
-            status.update(f"Status: error refreshing devices: {e}")
+            self.call_from_thread(self._apply_scan, None, f"Status: error refreshing devices: {e}")
             return
+        self.call_from_thread(self._apply_scan, new_devices)
 
-        # Keep only Qualcomm or explicit EDL PID devices
-        qual = [d for d in new_devices if (d.get("vendor") == "05c6" or d.get("product") == "9008")]
+    def _apply_scan(self, new_devices: Optional[List[Dict[str, Optional[str]]]], error: Optional[str] = None) -> None:
+        self._refresh_in_progress = False
+        if error:
+            self._status.update(error)
+        else:
+            self._show_scan(new_devices)
+            # Between hotplug events only a slow safety refresh runs; keep
+            # polling at the old rate while a device's adb state is unresolved
+            if self._hotplug_active and any(self._awaiting_adb(d) for d in self.devices):
+                self._schedule_followup_scan(_POLL_INTERVAL)
+        if self._refresh_pending:
+            self._refresh_pending = False
+            self._request_scan()
+
+    def _show_scan(self, new_devices: List[Dict[str, Optional[str]]]) -> None:
+        if self._apply_new_devices(new_devices):
+            self._show_device_count()
+
+    def _flush_ui(self) -> None:
+        # Runs on the app thread via set_interval, so the flags need no lock
+        if self._pending_progress_keys:
+            keys, self._pending_progress_keys = self._pending_progress_keys, set()
+            if not self._dirty:
+                self._flush_progress(keys)
+            if self._latest_status:
+                self._status.update(self._latest_status)
+        if self._dirty:
+            self._dirty = False
+            # Show the new flash status right away; the rescan runs in a worker
+            self._apply_new_devices(self.devices)
+            self._request_scan()
+
+    def _flush_progress(self, keys: set) -> None:
+        """Repaint just the Progress cell of the given rows, without rescanning."""
+        table = self._table
+        column = self._columns[3]
+        for key in keys:
+            row_key = self._row_keys.get(key)
+            if row_key is None:
+                continue
+            cells = self._last_rendered[key]
+            progress_cell = self._progress_cell(key)
+            if cells[3] != progress_cell:
+                table.update_cell(row_key, column, progress_cell)
+                self._last_rendered[key] = cells[:3] + (progress_cell,) + cells[4:]
+
+    def _progress_cell(self, key: str) -> str:
+        # Percentage (once qdl reports one) followed by the latest log line;
+        # lines are already truncated for display when they are received
+        line = self.last_lines.get(key)
+        pct = self.flash_progress.get(key)
+        if pct is None:
+            return line or "—"
+        return f"{pct:3d}% {line}" if line else f"{pct:3d}%"
+
+    def _prune_last_lines(self) -> None:
+        # Oldest first; never drop lines of attached or still-flashing devices
+        for key in list(self.last_lines):
+            if len(self.last_lines) <= _MAX_LAST_LINES:
+                break
+            if key not in self._by_key and key not in self.flashing_devices:
+                self.last_lines.pop(key, None)
+                self.flash_progress.pop(key, None)
+
+    def _show_device_count(self) -> None:
+        if not self.devices:
+            self._status.update("Status: no devices")
+            return
+        self._status.update(f"Status: {len(self.devices)} device(s)")
 
-        self.devices = qual
+    def _apply_new_devices(self, new_devices: List[Dict[str, Optional[str]]]) -> bool:
+        """Patch the table from a finished scan. Must run on the app thread.
 
-        # Rebuild table (Progress column shows latest streamed log line)
-        table.clear(columns=True)
-        table.add_columns("Sel", "Serial", "Status", "Progress", "Flash")
+        Returns True if the table was re-rendered.
+        """
+        table = self._table
 
-        if not qual:
-            table.add_row(" ", "No Qualcomm devices found", "—", "—")
-            status.update("Status: no devices")
-            return
+        # Keep only Qualcomm or explicit EDL PID devices
+        qual = [d for d in new_devices if d.get("vendor") in _QUAL_VENDORS or d.get("product") in _EDL_PRODUCTS]
+
+        for d in qual:
+            # Interned so set membership and signature compares hit the identity fast path
+            d["_key"] = sys.intern(self._device_key(d))
+        self.devices = qual
+        self._by_key = {d["_key"]: d for d in qual}
+        if len(self.last_lines) > _MAX_LAST_LINES:
+            self._prune_last_lines()
+
+        # Nothing that feeds the table changed since the last render
+        sig = (
+            tuple((d.get("usb"), d.get("serial"), d.get("product"), d.get("transport_id")) for d in qual),
+            frozenset(self.selected_keys),
+            tuple(sorted(self.flash_status.items())),
+            tuple(sorted(self.last_lines.items())),
+            tuple(sorted(self.flash_progress.items())),
+        )
+        if sig == self._last_sig:
+            return False
+        self._last_sig = sig
 
+        # Desired cells per device (Progress column shows latest streamed log line)
+        rows: Dict[str, tuple] = {}
         for d in qual:
-            key = self._device_key(d)
+            key = d["_key"]
             sel = "✓" if key in self.selected_keys else " "
             
-            # Extract serial number from product_str if available (like "SN:CB4713E8")
-            import re
-            serial_str = d.get("serial")
-            if not serial_str:
-                ps = d.get("product_str") or ""
-                m = re.search(r"SN[:=]?([A-F0-9]+)", ps, re.IGNORECASE)
-                if m:
-                    serial_str = m.group(1)
-            
             # Fallback to usb path if no serial
-            if not serial_str:
-                serial_str = d.get("usb") or "(no id)"
+            serial_str = extract_serial(d) or d.get("usb") or "(no id)"
             
             # Show EDL/ADB status
             device_status = "EDL" if d.get("product") == "9008" else "ADB"
@@ -156,127 +383,208 @@ class DeviceFlasher(App):
             # Show flash status
             flash_status = self.flash_status.get(key, "not started")
 
-            # Show latest streamed log line or a placeholder
-            latest_line = self.last_lines.get(key)
-            if latest_line:
-                # keep the cell compact
-                progress_cell = latest_line if len(latest_line) <= 80 else latest_line[:77] + "..."
-            else:
-                progress_cell = "—"
+            # Show flash percentage and latest streamed log line, or a placeholder
+            progress_cell = self._progress_cell(key)
 
-            table.add_row(sel, serial_str, device_status, progress_cell, flash_status)
+            rows[key] = (sel, serial_str, device_status, progress_cell, flash_status)
 
-        status.update(f"Status: {len(self.devices)} device(s)")
-        
-        # Restore cursor position
-        if saved_cursor_row is not None and saved_cursor_row >= 0:
-            try:
-                # Make sure cursor is within valid range
-                if saved_cursor_row < len(self.devices):
-                    table.move_cursor(row=saved_cursor_row)
-            except Exception:
-                pass
+        if not rows:
+            rows[_EMPTY_ROW] = (" ", "No Qualcomm devices found", "—", "—", "—")
+
+        # Patch the table in place: drop vanished rows, add new ones and only
+        # rewrite cells whose value changed. Rows persist, so the cursor stays put.
+        for key in [k for k in self._row_keys if k not in rows]:
+            table.remove_row(self._row_keys.pop(key))
+            self._last_rendered.pop(key, None)
+        for key, cells in rows.items():
+            row_key = self._row_keys.get(key)
+            if row_key is None:
+                self._row_keys[key] = table.add_row(*cells, key=key)
+            else:
+                for column, old, new in zip(self._columns, self._last_rendered[key], cells):
+                    if old != new:
+                        table.update_cell(row_key, column, new)
+            self._last_rendered[key] = cells
+        return True
 
     def action_refresh_devices(self) -> None:
-        self.refresh_devices_table()
+        self._request_scan()
 
     def action_toggle_device(self) -> None:
-        table = self.query_one("#devices-table", DataTable)
+        table = self._table
+        # Row order follows insertion, not self.devices, so go through the row key
         try:
-            row = table.cursor_row
+            row_key, _ = table.coordinate_to_cell_key(table.cursor_coordinate)
         except Exception:
             return
 
-        if row is None:
-            return
-
-        if row < 0 or row >= len(self.devices):
+        key = row_key.value
+        if key not in self._by_key:
             return
 
-        d = self.devices[row]
-        key = self._device_key(d)
         if key in self.selected_keys:
             self.selected_keys.remove(key)
         else:
-            self.selected_keys.add(key)
-        self.refresh_devices_table(silent=True)
+            self.selected_keys.add(sys.intern(key))
+        # Only the Sel column changes; re-render from the last scan
+        self._apply_new_devices(self.devices)
 
     def action_reboot_selected(self) -> None:
         # Trigger background reboot for selected devices
         if not self.selected_keys:
-            self.query_one("#status", Label).update("Status: no device selected")
+            self._status.update("Status: no device selected")
             return
-        self.reboot_selected_to_edl(list(self.selected_keys))
+        self.reboot_selected_to_edl(sorted(self.selected_keys))
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if event.input.id != "firmware-input":
+            return
+        # Debounce: restart the timer on every keystroke
+        if self._fw_validate_timer is not None:
+            self._fw_validate_timer.stop()
+        value = event.value.strip()
+        if not value:
+            self._firmware_input.remove_class("missing")
+            return
+        self._fw_validate_timer = self.set_timer(0.3, lambda: self._check_fw_path(value))
+
+    @work(thread=True, exclusive=True, group="fw-check")
+    def _check_fw_path(self, firmware_path: str) -> None:
+        # is_dir() can block for a long time on slow or network mounts
+        valid = self._validate_fw(firmware_path)
+        if not get_current_worker().is_cancelled:
+            self.call_from_thread(self._show_fw_check, firmware_path, valid)
+
+    def _validate_fw(self, firmware_path: str) -> bool:
+        # Runs in worker threads; the tuple is replaced in one assignment
+        valid = Path(firmware_path).is_dir()
+        self._fw_path_cache = (firmware_path, valid, time.monotonic())
+        return valid
+
+    def _show_fw_check(self, firmware_path: str, valid: bool) -> None:
+        # The path may have been edited again while the check ran
+        if self._firmware_input.value.strip() != firmware_path:
+            return
+        self._firmware_input.set_class(not valid, "missing")
+        if not valid:
+            self._status.update(f"Status: firmware path not found: {firmware_path}")
 
     def action_flash_selected(self) -> None:
         # Trigger background flash for selected devices
         if not self.selected_keys:
-            self.query_one("#status", Label).update("Status: no device selected")
+            self._status.update("Status: no device selected")
             return
         
         # Get firmware path from input
-        firmware_input = self.query_one("#firmware-input", Input)
+        firmware_input = self._firmware_input
         firmware_path = firmware_input.value.strip()
         
         if not firmware_path:
-            self.query_one("#status", Label).update("Status: firmware path required")
+            self._status.update("Status: firmware path required")
             return
         
-        if not Path(firmware_path).is_dir():
-            self.query_one("#status", Label).update(f"Status: firmware path not found: {firmware_path}")
+        # Snapshot the selection once, in a stable order, for both the
+        # classification and the flash loop in the worker thread
+        targets = tuple(sorted(self.selected_keys))
+
+        # Reuse a recent check of the same path (e.g. from the debounced
+        # validation); otherwise check it off the app thread, since a slow
+        # mount can take seconds to answer
+        cached_path, fw_valid, checked_at = self._fw_path_cache
+        if firmware_path == cached_path and time.monotonic() - checked_at < _FW_CHECK_TTL:
+            self._start_flash(targets, firmware_path, fw_valid)
+        else:
+            self._status.update("Status: checking firmware path...")
+            self._check_fw_then_flash(targets, firmware_path)
+
+    @work(thread=True, group="fw-check-flash")
+    def _check_fw_then_flash(self, targets: Tuple[str, ...], firmware_path: str) -> None:
+        valid = self._validate_fw(firmware_path)
+        self.call_from_thread(self._start_flash, targets, firmware_path, valid)
+
+    def _start_flash(self, targets: Tuple[str, ...], firmware_path: str, fw_valid: bool) -> None:
+        if not fw_valid:
+            self._status.update(f"Status: firmware path not found: {firmware_path}")
             return
-        
+
         # Separate ADB and EDL devices
         adb_devices = []
         edl_devices = []
         
-        for key in self.selected_keys:
-            for d in self.devices:
-                if key == self._device_key(d):
-                    if d.get("status") == "adb":
-                        adb_devices.append((key, d))
-                    else:
-                        edl_devices.append((key, d))
-                    break
+        for key in targets:
+            d = self._by_key.get(key)
+            if d is None:
+                continue
+            if d.get("status") == "adb":
+                adb_devices.append((key, d))
+            else:
+                edl_devices.append((key, d))
         
         # Start the flash sequence
-        self.flash_sequence(adb_devices, edl_devices, firmware_path)
+        self.flash_sequence(targets, adb_devices, edl_devices, firmware_path)
     
     @work(thread=True)
-    def flash_sequence(self, adb_devices: List, edl_devices: List, firmware_path: str) -> None:
+    def flash_sequence(self, targets: Tuple[str, ...], adb_devices: List, edl_devices: List, firmware_path: str) -> None:
         """Flash devices, rebooting ADB devices to EDL first."""
-        status = self.query_one("#status", Label)
+        status = self._status
         
         # Step 1: Reboot ADB devices to EDL
         if adb_devices:
             self.call_from_thread(status.update, f"Status: Rebooting {len(adb_devices)} ADB device(s) to EDL...")
             
-            for key, device in adb_devices:
-                tid = device.get("transport_id")
-                if tid:
-                    try:
-                        adb_reboot_edl(tid, confirm=False)
-                        self.call_from_thread(status.update, f"Status: Rebooted {key} to EDL, waiting...")
-                    except Exception as e:
-                        self.call_from_thread(status.update, f"Status: Failed to reboot {key}: {e}")
+            # Identities (usb path / serial) of devices we expect back in EDL
+            pending: Dict[str, set] = {}
+            rebootable = [(key, device) for key, device in adb_devices if device.get("transport_id")]
+            # Each reboot blocks on its own adb call, so issue them all at once
+            futures = {
+                self._pool.submit(adb_reboot_edl, device["transport_id"], confirm=False): (key, device)
+                for key, device in rebootable
+            }
+            for fut in as_completed(futures):
+                key, device = futures[fut]
+                try:
+                    res = fut.result()
+                except Exception as e:
+                    self.call_from_thread(status.update, f"Status: Failed to reboot {key}: {e}")
+                    continue
+                if res.get("success") != "true":
+                    self.call_from_thread(status.update, f"Status: Failed to reboot {key}: {res.get('msg')}")
+                    continue
+                pending[key] = {device.get("usb"), device.get("serial")} - {None}
+                self.call_from_thread(status.update, f"Status: Rebooted {key} to EDL, waiting...")
             
-            # Wait for devices to appear in EDL mode
-            self.call_from_thread(status.update, "Status: Waiting 5s for devices to enter EDL...")
-            time.sleep(5)
+            # Wait for devices to appear in EDL mode: poll instead of a fixed
+            # sleep and stop as soon as every rebooted device is back as 9008
+            self.call_from_thread(status.update, f"Status: Waiting up to {_EDL_WAIT_TIMEOUT:g}s for devices to enter EDL...")
+            deadline = time.monotonic() + _EDL_WAIT_TIMEOUT
+            while pending and time.monotonic() < deadline:
+                time.sleep(_EDL_POLL_INTERVAL)
+                try:
+                    devs = correlate_adb_and_usb(vendor="05c6")
+                except Exception:
+                    continue
+                in_edl = set()
+                for d in devs:
+                    if d.get("product") == "9008":
+                        in_edl.update((d.get("usb"), d.get("serial")))
+                pending = {k: ids for k, ids in pending.items() if not ids & in_edl}
             
-            # Refresh device list to get updated status
-            self.call_from_thread(self.refresh_devices_table)
-            time.sleep(1)  # Give UI time to update
+            # Refresh device list to get updated status, scanning in this thread
+            try:
+                devs = correlate_adb_and_usb(vendor="05c6")
+            except Exception as e:
+                self.call_from_thread(status.update, f"Status: error refreshing devices: {e}")
+            else:
+                self.call_from_thread(self._show_scan, devs)
         
         # Step 2: Flash all devices (original EDL + rebooted ADB)
         all_devices_to_flash = []
         
         # Re-scan to get updated device list with new EDL devices
-        for key in self.selected_keys:
-            for d in self.devices:
-                if key == self._device_key(d):
-                    all_devices_to_flash.append((key, d))
-                    break
+        for key in targets:
+            d = self._by_key.get(key)
+            if d is not None:
+                all_devices_to_flash.append((key, d))
         
         if not all_devices_to_flash:
             self.call_from_thread(status.update, "Status: No devices to flash")
@@ -287,85 +595,75 @@ class DeviceFlasher(App):
         for key, device in all_devices_to_flash:
             self.flashing_devices.add(key)
             self.flash_status[key] = "in progress"
-            # no progress counts — we will display the latest log line only
-            self.flash_device_bg(key, device, firmware_path)
+            self.flash_progress.pop(key, None)
+            # Workers are started from the app thread; this sequence runs in a thread
+            self.call_from_thread(self.flash_device_bg, key, device, firmware_path)
         
-        self.call_from_thread(self.refresh_devices_table)
+        self.call_from_thread(self._apply_new_devices, self.devices)
 
-    @work(thread=True)
-    def flash_device_bg(self, key: str, device: Dict, firmware_path: str) -> None:
-        """Flash a single device in background thread."""
-        status = self.query_one("#status", Label)
-        
-        # Extract serial for qdl command (same logic as display)
-        import re
-        serial = device.get("serial")
-        if not serial:
-            ps = device.get("product_str") or ""
-            m = re.search(r"SN[:=]?([A-F0-9]+)", ps, re.IGNORECASE)
-            if m:
-                serial = m.group(1)
+    @work
+    async def flash_device_bg(self, key: str, device: Dict, firmware_path: str) -> None:
+        """Flash a single device as an async worker on the app's event loop.
+
+        qdl output is awaited on the loop, so callbacks run on the app thread
+        and no thread hops are needed. Each worker only writes its own ``key``
+        in last_lines/flash_progress/flash_status/flashing_devices and sets ``_dirty``.
+        """
+        status = self._status
         
-        # Fallback to usb path if no serial found
-        if not serial:
-            serial = device.get("usb") or key
+        # Serial for qdl command (same logic as display), falling back to usb path
+        serial = extract_serial(device) or device.get("usb") or key
         
-        # Define a simple line callback: store the latest line and refresh UI
+        # Line callback: store the latest line and let _flush_ui pick it up,
+        # rather than repainting per line
         def _line_cb(line: str) -> None:
-            try:
-                self.last_lines[key] = line
-            except Exception:
-                pass
-            # refresh UI to show the latest line in Progress column
-            try:
-                self.call_from_thread(self.refresh_devices_table, True)
-            except Exception:
-                pass
-            # update a compact status line for the user
-            try:
-                self.call_from_thread(status.update, f"Status: {serial} | {line}")
-            except Exception:
-                pass
+            # keep the cell compact; truncate once here rather than per render
+            if len(line) > _MAX_LINE:
+                line = line[:_MAX_LINE - 3] + "..."
+            self.last_lines[key] = line
+            # compact status line for the user
+            self._latest_status = f"Status: {serial} | {line}"
+            self._pending_progress_keys.add(key)
+
+        # qdl reports per-image completion; flash_device_async only calls this
+        # when the integer percentage changes
+        def _progress_cb(pct: int) -> None:
+            self.flash_progress[key] = pct
+            self._pending_progress_keys.add(key)
 
         try:
             # Run flash in streaming-only mode (no writing to file) and pass the callback
-            returncode = flash_device(
+            returncode = await flash_device_async(
                 serial,
                 firmware_path,
                 output_callback=_line_cb,
-                logs_dir=None,
+                progress_callback=_progress_cb,
+                use_sudo=_USE_SUDO,
             )
+            # Don't let a pending flush repaint a stale output line over the result
+            self._latest_status = None
             
             if returncode == 0:
-                self.call_from_thread(status.update, f"Status: {serial} flashed successfully")
+                status.update(f"Status: {serial} flashed successfully")
                 self.flash_status[key] = "completed"
-                # final refresh to ensure progress shows final count
-                try:
-                    self.call_from_thread(self.refresh_devices_table, True)
-                except Exception:
-                    pass
             else:
-                self.call_from_thread(status.update, f"Status: {serial} flash failed (code {returncode})")
+                status.update(f"Status: {serial} flash failed (code {returncode})")
                 self.flash_status[key] = "failed"
         except Exception as e:
-            self.call_from_thread(status.update, f"Status: {serial} error: {e}")
+            status.update(f"Status: {serial} error: {e}")
             self.flash_status[key] = "failed"
         finally:
             self.flashing_devices.discard(key)
-            self.call_from_thread(self.refresh_devices_table)
+            # Picked up by the next _flush_ui tick like any other output
+            self._dirty = True
 
     @work(thread=True)
     def reboot_selected_to_edl(self, keys: List[str]) -> None:
-        status = self.query_one("#status", Label)
-        correlated = self.devices
-        count = 0
+        status = self._status
+        by_key = self._by_key
+        targets = []
         for key in keys:
-            # find device in correlated list
-            target = None
-            for d in correlated:
-                if key == self._device_key(d):
-                    target = d
-                    break
+            target = by_key.get(key)
             if not target:
                 continue
             tid = target.get("transport_id")
@@ -373,16 +671,29 @@ class DeviceFlasher(App):
                 # no adb transport id -> skip
                 self.call_from_thread(status.update, f"Status: device {key} has no adb transport id")
                 continue
-            # perform reboot (no interactive confirm here)
-            res = adb_reboot_edl(tid, confirm=False)
-            self.call_from_thread(status.update, f"Status: reboot {key} -> {res.get('msg')}")
-            count += 1
-            time.sleep(0.1)
+            targets.append((key, tid))
+        count = 0
+        if targets:
+            # perform reboots in parallel (no interactive confirm here)
+            futures = {self._pool.submit(adb_reboot_edl, tid, confirm=False): key for key, tid in targets}
+            for fut in as_completed(futures):
+                res = fut.result()
+                self.call_from_thread(status.update, f"Status: reboot {futures[fut]} -> {res.get('msg')}")
+                count += 1
         self.call_from_thread(status.update, f"Status: rebooted {count} device(s)")
 
     def on_unmount(self) -> None:
         """Cleanup on exit."""
-        self.auto_refresh_enabled = False
+        self._stop_refresh.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._stop_pipe_w is not None:
+            try:
+                os.write(self._stop_pipe_w, b"x")
+            except OSError:
+                # Watcher already exited and closed the read end
+                pass
+            os.close(self._stop_pipe_w)
+            self._stop_pipe_w = None
 
 
 if __name__ == "__main__":